@@ -23,10 +23,19 @@ Repository: https://github.com/adbyrne/OfficeCAD
 
 import FreeCAD
 import Part
-import Sketcher
-import PartDesign
 import MeshPart
+import numpy as np
 import os
+import tempfile
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+# Optional: Numba JIT for the profile arithmetic (useful for parameter sweeps)
+try:
+    from numba import njit
+except ImportError:
+    njit = None
 
 # =============================================================================
 # DESIGN PARAMETERS
@@ -81,271 +90,471 @@ BOTTOM_RAIL_HOLE_CENTER = -27.5  # mm
 BOTTOM_RAIL_HOLE_BOTTOM = -43.5  # mm
 
 
+@dataclass(frozen=True, slots=True)
+class BracketParams:
+    """
+    Design parameters for one bracket set (defaults are the values above).
+
+    Builders read dimensions from a single instance instead of module globals,
+    so variants can be generated without mutating the module, e.g.
+    create_all_brackets(params=BracketParams(frame_leg_depth=50.0)).
+    """
+    frame_leg_depth: float = FRAME_LEG_DEPTH
+    frame_leg_width: float = FRAME_LEG_WIDTH
+    frame_leg_thickness: float = FRAME_LEG_THICKNESS
+    rail_leg_height: float = RAIL_LEG_HEIGHT
+    rail_leg_thickness: float = RAIL_LEG_THICKNESS
+    top_rail_extension: float = TOP_RAIL_EXTENSION
+    bottom_rail_extension: float = BOTTOM_RAIL_EXTENSION
+    angle_brace_size: float = ANGLE_BRACE_SIZE
+    frame_hole_diameter: float = FRAME_HOLE_DIAMETER
+    top_frame_hole_inner: float = TOP_FRAME_HOLE_INNER
+    top_frame_hole_outer: float = TOP_FRAME_HOLE_OUTER
+    top_frame_hole_z: float = TOP_FRAME_HOLE_Z
+    bottom_frame_hole_top_inner: float = BOTTOM_FRAME_HOLE_TOP_INNER
+    bottom_frame_hole_top_outer: float = BOTTOM_FRAME_HOLE_TOP_OUTER
+    bottom_frame_hole_top_z: float = BOTTOM_FRAME_HOLE_TOP_Z
+    bottom_frame_hole_apex_x: float = BOTTOM_FRAME_HOLE_APEX_X
+    bottom_frame_hole_apex_z: float = BOTTOM_FRAME_HOLE_APEX_Z
+    rail_hole_center_dia: float = RAIL_HOLE_CENTER_DIA
+    rail_hole_outer_dia: float = RAIL_HOLE_OUTER_DIA
+    rail_hole_y_center: float = RAIL_HOLE_Y_CENTER
+    top_rail_hole_bottom: float = TOP_RAIL_HOLE_BOTTOM
+    top_rail_hole_center: float = TOP_RAIL_HOLE_CENTER
+    top_rail_hole_top: float = TOP_RAIL_HOLE_TOP
+    bottom_rail_hole_top: float = BOTTOM_RAIL_HOLE_TOP
+    bottom_rail_hole_center: float = BOTTOM_RAIL_HOLE_CENTER
+    bottom_rail_hole_bottom: float = BOTTOM_RAIL_HOLE_BOTTOM
+
+
+DEFAULT_PARAMS = BracketParams()
+
+
 # =============================================================================
 # HELPER FUNCTIONS
 # =============================================================================
 
-def create_l_profile_sketch(body, name="LProfileSketch"):
+# L-profile faces shared by every bracket, keyed by profile dimensions
+_L_PROFILE_FACES = {}
+
+# Most recent tessellations keyed by (shape hash, linear deflection, angular
+# deflection), least recently used first. Bounded so that sweeping design
+# variants in one session does not keep every shape and mesh alive.
+_MESH_CACHE = OrderedDict()
+_MESH_CACHE_SIZE = 4
+
+# Binary STL facet record: normal, three vertices, attribute byte count
+_STL_HEADER = b"Binary STL - prusa_rack_brackets.py".ljust(80, b"\0")
+_STL_FACET_DTYPE = np.dtype([
+    ("normal", "<f4", (3,)),
+    ("vertices", "<f4", (3, 3)),
+    ("attr", "<u2"),
+])
+
+
+def _l_profile_vertices(frame_d, frame_t, brace, rail_h, rail_t):
     """
-    Create the L-profile sketch with integrated angle brace.
+    Return the L-profile vertices as a tuple of (x, y) pairs.
+
+    Pure arithmetic with no FreeCAD objects, so it can be JIT-compiled.
+    """
+    return (
+        (-frame_d, -frame_t),       # 0: bottom-left
+        (-frame_d, 0.0),            # 1: top-left of frame leg
+        (-brace, 0.0),              # 2: start of angle brace
+        (0.0, brace),               # 3: end of angle brace
+        (0.0, rail_h),              # 4: top of rail leg (inner)
+        (rail_t, rail_h),           # 5: top of rail leg (outer)
+        (rail_t, 0.0),              # 6: base of rail leg (outer)
+        (rail_t, -frame_t),         # 7: bottom-right
+    )
+
+
+if njit is not None:
+    # On-disk caching needs a module file; exec()'d scripts have none
+    _l_profile_vertices = njit(cache="__file__" in globals())(_l_profile_vertices)
+
+
+def build_l_profile_face(p=DEFAULT_PARAMS):
+    """
+    Build the L-profile cross-section with integrated angle brace as a face.
+
+    The profile is a fixed polygon with no parametric constraints, so it is
+    built directly as an OCCT wire rather than through the Sketcher solver.
 
     Profile vertices (counterclockwise from bottom-left):
     (-45, -4) -> (-45, 0) -> (-10, 0) -> (0, 10) -> (0, 39) ->
     (4, 39) -> (4, 0) -> (4, -4) -> close
     """
-    sketch = body.newObject("Sketcher::SketchObject", name)
-    sketch.AttachmentSupport = [(body.Origin.OriginFeatures[3], "")]  # XY_Plane
-    sketch.MapMode = "FlatFace"
-
-    # Define vertices
-    vertices = [
-        (-FRAME_LEG_DEPTH, -FRAME_LEG_THICKNESS),           # 0: bottom-left
-        (-FRAME_LEG_DEPTH, 0),                               # 1: top-left of frame leg
-        (-ANGLE_BRACE_SIZE, 0),                              # 2: start of angle brace
-        (0, ANGLE_BRACE_SIZE),                               # 3: end of angle brace
-        (0, RAIL_LEG_HEIGHT),                                # 4: top of rail leg (inner)
-        (RAIL_LEG_THICKNESS, RAIL_LEG_HEIGHT),               # 5: top of rail leg (outer)
-        (RAIL_LEG_THICKNESS, 0),                             # 6: base of rail leg (outer)
-        (RAIL_LEG_THICKNESS, -FRAME_LEG_THICKNESS),          # 7: bottom-right
-    ]
+    vertices = _l_profile_vertices(
+        p.frame_leg_depth, p.frame_leg_thickness, p.angle_brace_size,
+        p.rail_leg_height, p.rail_leg_thickness
+    )
+
+    # Each vertex is allocated once; the closing point reuses the first Vector
+    vecs = [FreeCAD.Vector(float(x), float(y), 0) for x, y in vertices]
+    wire = Part.makePolygon(vecs + vecs[:1])
+    return Part.Face(wire)
 
-    # Create lines
-    for i in range(len(vertices)):
-        p1 = FreeCAD.Vector(vertices[i][0], vertices[i][1], 0)
-        p2 = FreeCAD.Vector(vertices[(i+1) % len(vertices)][0], vertices[(i+1) % len(vertices)][1], 0)
-        sketch.addGeometry(Part.LineSegment(p1, p2), False)
 
-    # Add constraints (simplified - full constraints would be added for parametric design)
-    sketch.recompute()
-    return sketch
+def _get_l_profile_face(p=DEFAULT_PARAMS):
+    """Return the cached L-profile face, building it on first call."""
+    key = (p.frame_leg_depth, p.frame_leg_thickness, p.angle_brace_size,
+           p.rail_leg_height, p.rail_leg_thickness)
+    face = _L_PROFILE_FACES.get(key)
+    if face is None:
+        face = _L_PROFILE_FACES[key] = build_l_profile_face(p)
+    return face
 
 
-def create_frame_holes_sketch(body, base_feature, holes_config, name="FrameHolesSketch"):
+def build_bracket_base(rail_extension, p=DEFAULT_PARAMS):
     """
-    Create frame mounting holes sketch on the bottom face of frame leg.
+    Build the padded L-profile plus rail leg extension as a single solid.
 
-    holes_config: list of (x_from_inside_edge, z_position) tuples
+    rail_extension: extension length along Z beyond the frame leg; negative
+    values extend the rail leg below the base (-Z) instead of above it, and
+    zero leaves the plain L-profile.
     """
-    sketch = body.newObject("Sketcher::SketchObject", name)
+    lprofile = _get_l_profile_face(p).extrude(FreeCAD.Vector(0, 0, p.frame_leg_width))
+    if rail_extension == 0:
+        return lprofile
+
+    # Rail leg cross-section continued past the frame leg
+    ext_z = p.frame_leg_width if rail_extension > 0 else 0
+    ext_face = Part.makePlane(p.rail_leg_thickness, p.rail_leg_height, FreeCAD.Vector(0, 0, ext_z))
+    extension = ext_face.extrude(FreeCAD.Vector(0, 0, rail_extension))
+
+    # Left unrefined: the hole cuts split these faces again, so coplanar
+    # faces are merged once on the finished bracket instead
+    return lprofile.fuse(extension)
 
-    # Attach to bottom face of frame leg (Y = -4 face)
-    sketch.AttachmentSupport = [(base_feature, "Face")]  # Will need face selection
-    sketch.MapMode = "FlatFace"
 
-    for x_pos, z_pos in holes_config:
-        # X is negative (from inside edge toward outside)
-        sketch.addGeometry(Part.Circle(
-            FreeCAD.Vector(-x_pos, z_pos, 0),
-            FreeCAD.Vector(0, 0, 1),
-            FRAME_HOLE_DIAMETER / 2
-        ), False)
+def frame_hole_cylinders(holes_config, p=DEFAULT_PARAMS):
+    """
+    Create frame mounting hole cylinders through the frame leg (Y = -4 to 0).
 
-    sketch.recompute()
-    return sketch
+    holes_config: list of (x_from_inside_edge, z_position) tuples
+    """
+    # X is negative (from inside edge toward outside); cylinders overshoot
+    # both faces by 1mm so the cut leaves no skin
+    axis = FreeCAD.Vector(0, 1, 0)
+    return [
+        Part.makeCylinder(
+            p.frame_hole_diameter / 2,
+            p.frame_leg_thickness + 2,
+            FreeCAD.Vector(-x_pos, -p.frame_leg_thickness - 1, z_pos),
+            axis
+        )
+        for x_pos, z_pos in holes_config
+    ]
 
 
-def create_rail_holes_sketch(body, base_feature, holes_config, name="RailHolesSketch"):
+def rail_hole_cylinders(holes_config, p=DEFAULT_PARAMS):
     """
-    Create rail mounting holes sketch on the outer face of rail leg.
+    Create rail mounting hole cylinders through the rail leg (X = 0 to 4).
 
     holes_config: list of (z_position, diameter) tuples
     """
-    sketch = body.newObject("Sketcher::SketchObject", name)
-    sketch.MapMode = "FlatFace"
+    axis = FreeCAD.Vector(1, 0, 0)
+    return [
+        Part.makeCylinder(
+            diameter / 2,
+            p.rail_leg_thickness + 2,
+            FreeCAD.Vector(-1, p.rail_hole_y_center, z_pos),
+            axis
+        )
+        for z_pos, diameter in holes_config
+    ]
 
-    for z_pos, diameter in holes_config:
-        sketch.addGeometry(Part.Circle(
-            FreeCAD.Vector(-RAIL_HOLE_Y_CENTER, z_pos, 0),
-            FreeCAD.Vector(0, 0, 1),
-            diameter / 2
-        ), False)
 
-    sketch.recompute()
-    return sketch
+def drill_holes(shape, holes):
+    """
+    Cut a list of hole cylinders from a shape.
+
+    The holes are combined into one compound cutter so OCCT performs a single
+    boolean instead of one per hole.
+    """
+    return shape.cut(Part.Compound(holes))
 
 
 # =============================================================================
 # MAIN BRACKET CREATION FUNCTIONS
 # =============================================================================
 
-def create_top_bracket_left(doc):
+def create_top_bracket_left(doc, p=DEFAULT_PARAMS):
     """Create the top-left bracket with all features."""
 
-    # Create PartDesign Body
-    body = doc.addObject("PartDesign::Body", "TopBracketLeftBody")
-
-    # 1. L-Profile base sketch and pad
-    lprofile = create_l_profile_sketch(body, "LProfileSketch")
-
-    pad = body.newObject("PartDesign::Pad", "LProfilePad")
-    pad.Profile = lprofile
-    pad.Length = FRAME_LEG_WIDTH
-    pad.Refine = True
-
-    # 2. Rail extension sketch and pad
-    ext_sketch = body.newObject("Sketcher::SketchObject", "RailExtensionSketch")
-    ext_sketch.MapMode = "FlatFace"
-    # Rectangle for rail extension on top face
-    ext_sketch.addGeometry(Part.LineSegment(
-        FreeCAD.Vector(0, 0, 0),
-        FreeCAD.Vector(RAIL_LEG_THICKNESS, 0, 0)
-    ), False)
-    ext_sketch.addGeometry(Part.LineSegment(
-        FreeCAD.Vector(RAIL_LEG_THICKNESS, 0, 0),
-        FreeCAD.Vector(RAIL_LEG_THICKNESS, RAIL_LEG_HEIGHT, 0)
-    ), False)
-    ext_sketch.addGeometry(Part.LineSegment(
-        FreeCAD.Vector(RAIL_LEG_THICKNESS, RAIL_LEG_HEIGHT, 0),
-        FreeCAD.Vector(0, RAIL_LEG_HEIGHT, 0)
-    ), False)
-    ext_sketch.addGeometry(Part.LineSegment(
-        FreeCAD.Vector(0, RAIL_LEG_HEIGHT, 0),
-        FreeCAD.Vector(0, 0, 0)
-    ), False)
-
-    ext_pad = body.newObject("PartDesign::Pad", "RailExtensionPad")
-    ext_pad.Profile = ext_sketch
-    ext_pad.Length = TOP_RAIL_EXTENSION - FRAME_LEG_WIDTH  # 57mm extension
-    ext_pad.Refine = True
+    # 1-2. L-profile base and rail extension (57mm, +Z)
+    shape = build_bracket_base(p.top_rail_extension - p.frame_leg_width, p)
 
     # 3. Frame holes
     frame_holes_config = [
-        (TOP_FRAME_HOLE_INNER, TOP_FRAME_HOLE_Z),
-        (TOP_FRAME_HOLE_OUTER, TOP_FRAME_HOLE_Z),
+        (p.top_frame_hole_inner, p.top_frame_hole_z),
+        (p.top_frame_hole_outer, p.top_frame_hole_z),
     ]
-    frame_sketch = create_frame_holes_sketch(body, pad, frame_holes_config, "FrameHolesSketch")
-
-    frame_pocket = body.newObject("PartDesign::Pocket", "FrameHolesPocket")
-    frame_pocket.Profile = frame_sketch
-    frame_pocket.Type = "ThroughAll"
 
     # 4. Rail holes
     rail_holes_config = [
-        (TOP_RAIL_HOLE_BOTTOM, RAIL_HOLE_OUTER_DIA),
-        (TOP_RAIL_HOLE_CENTER, RAIL_HOLE_CENTER_DIA),
-        (TOP_RAIL_HOLE_TOP, RAIL_HOLE_OUTER_DIA),
+        (p.top_rail_hole_bottom, p.rail_hole_outer_dia),
+        (p.top_rail_hole_center, p.rail_hole_center_dia),
+        (p.top_rail_hole_top, p.rail_hole_outer_dia),
     ]
-    rail_sketch = create_rail_holes_sketch(body, ext_pad, rail_holes_config, "RailHolesSketch")
 
-    rail_pocket = body.newObject("PartDesign::Pocket", "RailHolesPocket")
-    rail_pocket.Profile = rail_sketch
-    rail_pocket.Type = "ThroughAll"
+    # Both hole groups in a single boolean cut
+    shape = drill_holes(
+        shape,
+        frame_hole_cylinders(frame_holes_config, p) + rail_hole_cylinders(rail_holes_config, p)
+    )
 
-    doc.recompute()
-    return body
+    bracket = doc.addObject("Part::Feature", "TopBracketLeft")
+    bracket.Shape = shape.removeSplitter()  # Refine once, on the final shape
+    return bracket
 
 
-def create_bottom_bracket_left(doc):
+def create_bottom_bracket_left(doc, p=DEFAULT_PARAMS):
     """Create the bottom-left bracket with triangle hole pattern."""
 
-    body = doc.addObject("PartDesign::Body", "BottomBracketLeftBody")
-
     # Similar to top bracket but with:
     # - Rail extension in -Z direction
     # - Triangle frame hole pattern (2 at top, apex at bottom)
 
-    # 1. L-Profile base (same as top)
-    lprofile = create_l_profile_sketch(body, "BottomLProfileSketch")
-
-    pad = body.newObject("PartDesign::Pad", "BottomLProfilePad")
-    pad.Profile = lprofile
-    pad.Length = FRAME_LEG_WIDTH
-    pad.Refine = True
-
-    # 2. Rail extension in -Z direction
-    ext_sketch = body.newObject("Sketcher::SketchObject", "BottomRailExtensionSketch")
-    ext_sketch.MapMode = "FlatFace"
-
-    ext_pad = body.newObject("PartDesign::Pad", "BottomRailExtensionPad")
-    ext_pad.Profile = ext_sketch
-    ext_pad.Length = BOTTOM_RAIL_EXTENSION - FRAME_LEG_WIDTH  # 55mm extension
-    ext_pad.Reversed = True  # Extend in -Z direction
-    ext_pad.Refine = True
+    # 1-2. L-profile base (same as top) and rail extension (55mm, -Z)
+    shape = build_bracket_base(-(p.bottom_rail_extension - p.frame_leg_width), p)
 
     # 3. Frame holes (triangle pattern)
     frame_holes_config = [
-        (BOTTOM_FRAME_HOLE_TOP_INNER, BOTTOM_FRAME_HOLE_TOP_Z),
-        (BOTTOM_FRAME_HOLE_TOP_OUTER, BOTTOM_FRAME_HOLE_TOP_Z),
-        (BOTTOM_FRAME_HOLE_APEX_X, BOTTOM_FRAME_HOLE_APEX_Z),
+        (p.bottom_frame_hole_top_inner, p.bottom_frame_hole_top_z),
+        (p.bottom_frame_hole_top_outer, p.bottom_frame_hole_top_z),
+        (p.bottom_frame_hole_apex_x, p.bottom_frame_hole_apex_z),
     ]
-    frame_sketch = create_frame_holes_sketch(body, pad, frame_holes_config, "BottomFrameHolesSketch")
-
-    frame_pocket = body.newObject("PartDesign::Pocket", "BottomFrameHolesPocket")
-    frame_pocket.Profile = frame_sketch
-    frame_pocket.Type = "ThroughAll"
 
     # 4. Rail holes (in -Z region)
     rail_holes_config = [
-        (BOTTOM_RAIL_HOLE_TOP, RAIL_HOLE_OUTER_DIA),
-        (BOTTOM_RAIL_HOLE_CENTER, RAIL_HOLE_CENTER_DIA),
-        (BOTTOM_RAIL_HOLE_BOTTOM, RAIL_HOLE_OUTER_DIA),
+        (p.bottom_rail_hole_top, p.rail_hole_outer_dia),
+        (p.bottom_rail_hole_center, p.rail_hole_center_dia),
+        (p.bottom_rail_hole_bottom, p.rail_hole_outer_dia),
     ]
-    rail_sketch = create_rail_holes_sketch(body, ext_pad, rail_holes_config, "BottomRailHolesSketch")
 
-    rail_pocket = body.newObject("PartDesign::Pocket", "BottomRailHolesPocket")
-    rail_pocket.Profile = rail_sketch
-    rail_pocket.Type = "ThroughAll"
+    # Both hole groups in a single boolean cut
+    shape = drill_holes(
+        shape,
+        frame_hole_cylinders(frame_holes_config, p) + rail_hole_cylinders(rail_holes_config, p)
+    )
+
+    bracket = doc.addObject("Part::Feature", "BottomBracketLeft")
+    bracket.Shape = shape.removeSplitter()  # Refine once, on the final shape
+    return bracket
 
-    doc.recompute()
-    return body
 
+def mirror_bracket(doc, source, new_name, p=DEFAULT_PARAMS):
+    """
+    Create a mirrored copy of a bracket.
 
-def mirror_bracket(doc, source_body, new_name):
-    """Create a mirrored copy of a bracket body."""
-    # Create mirror using Part::Mirroring
-    mirror = doc.addObject("Part::Mirroring", new_name)
-    mirror.Source = source_body
-    mirror.Normal = FreeCAD.Vector(0, 1, 0)  # Mirror across XZ plane
-    mirror.Base = FreeCAD.Vector(0, FRAME_LEG_WIDTH / 2, 0)  # Center of bracket
-    doc.recompute()
+    The mirror is a static shape rather than a Part::Mirroring feature, so it
+    adds no dependency on the source and is never re-mirrored on recompute.
+    """
+    mirrored = source.Shape.mirror(
+        FreeCAD.Vector(0, p.frame_leg_width / 2, 0),  # Center of bracket
+        FreeCAD.Vector(0, 1, 0)                     # Mirror across XZ plane
+    )
+    mirror = doc.addObject("Part::Feature", new_name)
+    mirror.Shape = mirrored
     return mirror
 
 
-def export_stl(shape, filepath, linear_deflection=0.1, angular_deflection=0.1):
-    """Export a shape to STL file."""
+def mirror_mesh(mesh, p=DEFAULT_PARAMS):
+    """
+    Return a copy of a bracket mesh mirrored the same way as mirror_bracket.
+
+    Reflecting the existing triangulation is a linear vertex transform, much
+    cheaper than tessellating the mirrored BRep again.
+    """
+    mirror_matrix = FreeCAD.Matrix()
+    mirror_matrix.A22 = -1
+    mirror_matrix.A24 = p.frame_leg_width  # Reflect across Y = frame_leg_width / 2
+    mirrored = mesh.copy()
+    mirrored.transform(mirror_matrix)
+    mirrored.flipNormals()  # Reflection reverses facet winding
+    return mirrored
+
+
+def write_binary_stl(mesh, filepath):
+    """
+    Write a mesh as a binary STL file and return the facet count.
+
+    Facet normals are computed and packed with vectorised NumPy operations
+    straight from the mesh topology.
+    """
+    points, facets = mesh.Topology
+    # Base.Vector is a 3-sequence, so NumPy converts the points in one call
+    verts = np.array(points, dtype="<f4").reshape(-1, 3)
+    tris = np.array(facets, dtype=np.uint32).reshape(-1, 3)
+
+    corners = verts[tris]  # (n, 3, 3)
+    normals = np.cross(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 1])
+    normals /= np.linalg.norm(normals, axis=1, keepdims=True) + 1e-12
+
+    records = np.zeros(len(tris), dtype=_STL_FACET_DTYPE)
+    records["normal"] = normals
+    records["vertices"] = corners
+
+    # Assemble the whole file in memory and issue a single write through a
+    # 1 MiB buffer; writing to a temp file and renaming keeps the target
+    # complete even if the export is interrupted
+    payload = b"".join((_STL_HEADER, np.array(len(tris), "<u4").tobytes(), records.tobytes()))
+    tmp_path = filepath + ".tmp"
+    with open(tmp_path, "wb", buffering=1 << 20) as f:
+        f.write(payload)
+    os.replace(tmp_path, filepath)
+    return len(tris)
+
+
+def write_mesh(mesh, filepath):
+    """Write a mesh to an STL file."""
+    count = write_binary_stl(mesh, filepath)
+    print(f"Exported: {filepath} ({count} facets)")
+
+
+def mesh_shape(shape, linear_deflection, angular_deflection):
+    """
+    Tessellate a shape, reusing an earlier mesh of the same shape and settings.
+
+    Re-exporting an unchanged shape then only costs the STL write. Only the
+    few most recently used meshes are kept.
+    """
+    key = (shape.hashCode(), linear_deflection, angular_deflection)
+    cached = _MESH_CACHE.get(key)
+    if cached is not None and cached[0].isSame(shape):
+        _MESH_CACHE.move_to_end(key)
+        return cached[1]
+
     mesh = MeshPart.meshFromShape(
         shape,
         LinearDeflection=linear_deflection,
         AngularDeflection=angular_deflection
     )
-    mesh.write(filepath)
-    print(f"Exported: {filepath} ({len(mesh.Facets)} facets)")
+    _MESH_CACHE[key] = (shape, mesh)
+    _MESH_CACHE.move_to_end(key)
+    while len(_MESH_CACHE) > _MESH_CACHE_SIZE:
+        _MESH_CACHE.popitem(last=False)
+    return mesh
+
+
+def export_stl(shape, filepath, linear_deflection=0.25, angular_deflection=0.35):
+    """Export a shape to STL file and return the generated mesh."""
+    mesh = mesh_shape(shape, linear_deflection, angular_deflection)
+    write_mesh(mesh, filepath)
+    return mesh
+
+
+def export_stl_pair(shape, left_path, right_path, linear_deflection=0.25, angular_deflection=0.35,
+                    p=DEFAULT_PARAMS):
+    """Export a left bracket and its mirror image from a single tessellation."""
+    mesh = export_stl(shape, left_path, linear_deflection, angular_deflection)
+    write_mesh(mirror_mesh(mesh, p), right_path)
+
+
+def _export_brep_worker(brep_path, left_path, right_path, linear_deflection, angular_deflection, p):
+    """Process-pool worker: load a bracket from a BRep file and export its STL pair."""
+    shape = Part.Shape()
+    shape.importBrep(brep_path)
+    export_stl_pair(shape, left_path, right_path, linear_deflection, angular_deflection, p)
 
 
 # =============================================================================
 # MAIN ENTRY POINT
 # =============================================================================
 
-def create_all_brackets(export_dir=None):
+def create_all_brackets(export_dir=None, linear_deflection=0.25, angular_deflection=0.35,
+                        stl_only=False, params=None, use_processes=False):
     """
     Create all four brackets and optionally export STL files.
 
     Args:
         export_dir: Directory for STL export. If None, no export.
+        linear_deflection: STL tessellation tolerance in mm. The default stays
+            below a 0.2-0.3mm FDM layer height.
+        angular_deflection: STL tessellation angle tolerance in radians.
+        stl_only: Skip adding the right-hand brackets to the document. Their
+            STLs are still written from the mirrored left meshes.
+        params: BracketParams for a design variant. If None, the module
+            defaults are used.
+        use_processes: Tessellate in worker processes instead of in turn in
+            this process. Each shape is passed to its worker as a BRep file.
+            Memory is freed when the worker exits, and workers run on
+            separate cores. Needs FreeCAD importable from sys.executable,
+            e.g. FreeCADCmd, and this script imported as a module: workers
+            cannot find functions defined by exec() in __main__.
 
     Returns:
-        dict: Dictionary of created bracket objects
+        dict: Dictionary of created bracket objects (right brackets are None
+            when stl_only is set)
     """
+    p = params or DEFAULT_PARAMS
+    if use_processes and _export_brep_worker.__module__ == "__main__":
+        raise ValueError("use_processes needs prusa_rack_brackets imported as a module, "
+                         "not run with exec()")
+
     # Create new document
     doc = FreeCAD.newDocument("PrusaRackBrackets")
 
-    # Create left brackets
-    top_left = create_top_bracket_left(doc)
-    bottom_left = create_bottom_bracket_left(doc)
-
-    # Create right brackets (mirrored)
-    top_right = mirror_bracket(doc, top_left, "TopBracketRight")
-    bottom_right = mirror_bracket(doc, bottom_left, "BottomBracketRight")
-
+    # Build all features in one undo transaction with recomputes frozen
+    # (FreeCAD 0.21+), so property writes never trigger an implicit recompute
+    # and the document is evaluated exactly once.
+    can_freeze = hasattr(doc, "RecomputesFrozen")
+    if can_freeze:
+        doc.RecomputesFrozen = True
+    doc.openTransaction("build")
+
+    try:
+        # Create left brackets
+        top_left = create_top_bracket_left(doc, p)
+        bottom_left = create_bottom_bracket_left(doc, p)
+
+        # Create right brackets (mirrored); export never needs them because
+        # the right STLs are mirrored from the left meshes
+        top_right = bottom_right = None
+        if not stl_only:
+            top_right = mirror_bracket(doc, top_left, "TopBracketRight", p)
+            bottom_right = mirror_bracket(doc, bottom_left, "BottomBracketRight", p)
+    except Exception:
+        # Never leave a half-built document behind as the undo step
+        doc.abortTransaction()
+        raise
+    else:
+        doc.commitTransaction()
+    finally:
+        if can_freeze:
+            doc.RecomputesFrozen = False
     doc.recompute()
 
     # Export STLs if directory provided
     if export_dir:
         os.makedirs(export_dir, exist_ok=True)
-        export_stl(top_left.Shape, os.path.join(export_dir, "top_bracket_left.stl"))
-        export_stl(top_right.Shape, os.path.join(export_dir, "top_bracket_right.stl"))
-        export_stl(bottom_left.Shape, os.path.join(export_dir, "bottom_bracket_left.stl"))
-        export_stl(bottom_right.Shape, os.path.join(export_dir, "bottom_bracket_right.stl"))
+        exports = [
+            (top_left, "top_bracket_left.stl", "top_bracket_right.stl"),
+            (bottom_left, "bottom_bracket_left.stl", "bottom_bracket_right.stl"),
+        ]
+        # Tessellate each left bracket once and mirror the mesh for the right
+        # bracket
+        jobs = [
+            (obj.Shape, os.path.join(export_dir, left), os.path.join(export_dir, right),
+             linear_deflection, angular_deflection, p)
+            for obj, left, right in exports
+        ]
+        if use_processes:
+            with tempfile.TemporaryDirectory() as brep_dir:
+                with ProcessPoolExecutor(max_workers=len(jobs)) as executor:
+                    futures = []
+                    for i, (shape, *args) in enumerate(jobs):
+                        brep_path = os.path.join(brep_dir, f"bracket_{i}.brep")
+                        shape.exportBrep(brep_path)
+                        futures.append(executor.submit(_export_brep_worker, brep_path, *args))
+                    for future in futures:
+                        future.result()
+        else:
+            for job in jobs:
+                export_stl_pair(*job)
 
     return {
         "document": doc,
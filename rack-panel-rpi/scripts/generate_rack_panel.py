@@ -6,15 +6,26 @@ Generates a three-piece 1U rack panel (center panel + 2 end tabs) in FreeCAD
 via the XML-RPC bridge at localhost:9875.
 
 Usage:
-    python3 generate_rack_panel.py [--output-dir DIR] [--no-export]
+    python3 generate_rack_panel.py [--output-dir DIR] [--no-export] [--merged-stl]
+                                   [--use-cache]
+
+With --use-cache, outputs are cached under <output-dir>/.cache/<signature>/
+keyed on a SHA-256 of the generated FreeCAD scripts; an unchanged re-run copies
+them back instead of rebuilding in FreeCAD. Part shapes are also baked to BRep
+files under <output-dir>/.cache/brep/ and reloaded while their geometry code is
+unchanged. The key only covers the scripts, so leave it off after upgrading
+FreeCAD.
 
 Requires: FreeCAD running with the Robust MCP bridge active on port 9875.
 """
 
 import xmlrpc.client
-import json
+import hashlib
+import textwrap
 import math
 import argparse
+import os
+import shutil
 import sys
 
 # ─── Parameters ──────────────────────────────────────────────────────────────
@@ -83,15 +94,37 @@ WALL_SLOT_X_CENTERS = [31.0, 101.0, 115.0, 185.0]
 # Fillets
 WALL_FILLET_RADIUS = 2.0       # Wall-to-faceplate inside corners
 
+# STL tessellation
+STL_LINEAR_DEFLECTION = 0.3    # Max chord deviation (mm); flat faces are unaffected
+STL_ANGULAR_DEFLECTION = 0.5   # Max angle per facet (rad); keeps ~13 facets on M3 holes
+
 # ─── Derived values ──────────────────────────────────────────────────────────
 TOTAL_DEPTH = LIP_DEPTH + FACE_PLATE_THICKNESS + SHELF_DEPTH  # 41mm
 TAB_TOTAL_WIDTH = TAB_RAIL_WIDTH + TAB_OVERLAP_WIDTH  # 27mm
 RAIL_HOLE_X_CENTER = -(TAB_RAIL_WIDTH / 2)  # Centered in rail section
 HEX_CIRCUMRADIUS = NUT_ACROSS_FLATS / (2 * math.cos(math.radians(30)))
+# Hex nut vertex offsets from the hole centre (flats parallel to Y)
+HEX_OFFSETS = [(HEX_CIRCUMRADIUS * math.cos(math.radians(60 * j + 30)),
+                HEX_CIRCUMRADIUS * math.sin(math.radians(60 * j + 30)))
+               for j in range(6)]
+
+# Exported bodies and their STL file names
+EXPORT_PARTS = [("CenterPanelBody", "CenterPanel"),
+                ("LeftTabBody", "LeftTab"),
+                ("RightTabBody", "RightTab"),
+                ("SideBarBody", "SideBar")]
 
 
 # ─── FreeCAD execution helpers ───────────────────────────────────────────────
 
+class GzipTransport(xmlrpc.client.Transport):
+    """XML-RPC transport that gzip-compresses every request body.
+
+    The bridge must decode Content-Encoding: gzip (SimpleXMLRPCServer does).
+    """
+    encode_threshold = 0
+
+
 def execute(proxy, code):
     """Execute Python code in FreeCAD, return result or raise on error."""
     result = proxy.execute(code)
@@ -102,228 +135,68 @@ def execute(proxy, code):
     return result.get('result')
 
 
-def make_rectangle_lines(points_str):
-    """Return FreeCAD code to add a closed rectangle from 4 corner vectors."""
-    return f"""
-pts = {points_str}
-for i in range(4):
-    sketch.addGeometry(Part.LineSegment(pts[i], pts[(i+1)%4]), False)
-for i in range(4):
-    sketch.addConstraint(Sketcher.Constraint("Coincident", i, 2, (i+1)%4, 1))
+def execute_many(proxy, blobs):
+    """Execute several code blobs in FreeCAD in a single round trip.
+
+    The blobs run back-to-back in one namespace; returns the list of each
+    blob's _result_.
+    """
+    parts = ["_results_ = []"]
+    for blob in blobs:
+        parts.append(blob)
+        parts.append("_results_.append(_result_)")
+    parts.append("_result_ = _results_")
+    return execute(proxy, "\n# ---\n".join(parts))
+
+
+# Geometry helpers defined once in FreeCAD by create_document_script(), so the
+# part scripts send one-line calls instead of repeating the construction code
+_FREECAD_HELPERS = """
+V = FreeCAD.Vector  # Shared by every part script in the batch
+
+def polygon_prism(pts, direction):
+    # Closed polygon through (x, y, z) points, extruded by direction
+    vecs = [V(*p) for p in pts]
+    return Part.Face(Part.makePolygon(vecs + [vecs[0]])).extrude(direction)
+
+def z_cylinders(circles, z_min, height):
+    # Z-axis cylinders for (x, y, radius) circles, spanning z_min..z_min+height
+    return [Part.makeCylinder(r, height, V(x, y, z_min))
+            for x, y, r in circles]
 """
 
 
 # ─── Build functions ─────────────────────────────────────────────────────────
-
-def create_document(proxy):
-    """Step 1: Create document and center panel body."""
-    execute(proxy, """
+# Each *_script() returns the FreeCAD code for one step; main() sends them all
+# to the bridge together so the recipe is compiled and run in a single call.
+
+def create_document_script():
+    """Step 1: Import modules, define the shared helpers and create the document."""
+    return """
+import os
+import Part
+""" + _FREECAD_HELPERS + """
 doc = FreeCAD.newDocument("RackPanel")
 doc.Label = "RackPanel"
 FreeCAD.setActiveDocument("RackPanel")
-doc.recompute()
 _result_ = {"doc": doc.Name}
-""")
-
-
-def build_center_panel(proxy):
-    """Steps 2-7: Build the complete center panel."""
-    p = {
-        'W': PANEL_WIDTH, 'H': RACK_1U_HEIGHT,
-        'FPT': FACE_PLATE_THICKNESS, 'WT': WALL_THICKNESS,
-        'SD': SHELF_DEPTH, 'LD': LIP_DEPTH, 'LI': LIP_INSET,
-    }
-
-    # Create body
-    execute(proxy, """
-doc = FreeCAD.ActiveDocument
-body = doc.addObject("PartDesign::Body", "CenterPanelBody")
-body.Label = "CenterPanelBody"
-doc.recompute()
-_result_ = {"body": body.Name}
-""")
-
-    # Face plate pad
-    execute(proxy, f"""
-import Part, Sketcher
-doc = FreeCAD.ActiveDocument
-body = doc.getObject("CenterPanelBody")
-sketch = body.newObject("Sketcher::SketchObject", "FacePlateSketch")
-sketch.AttachmentSupport = [(body.Origin.getObject("XY_Plane"), "")]
-sketch.MapMode = "FlatFace"
-doc.recompute()
-pts = [FreeCAD.Vector(0,0,0), FreeCAD.Vector({p['W']},0,0),
-       FreeCAD.Vector({p['W']},{p['H']},0), FreeCAD.Vector(0,{p['H']},0)]
-for i in range(4):
-    sketch.addGeometry(Part.LineSegment(pts[i], pts[(i+1)%4]), False)
-for i in range(4):
-    sketch.addConstraint(Sketcher.Constraint("Coincident", i, 2, (i+1)%4, 1))
-doc.recompute()
-pad = body.newObject("PartDesign::Pad", "FacePlatePad")
-pad.Profile = sketch
-pad.Length = {p['FPT']}
-pad.Reversed = False
-pad.Refine = True
-doc.recompute()
-_result_ = {{"ok": True}}
-""")
-
-    # Bottom wall
-    execute(proxy, f"""
-import Part, Sketcher
-doc = FreeCAD.ActiveDocument
-body = doc.getObject("CenterPanelBody")
-sketch = body.newObject("Sketcher::SketchObject", "BottomWallSketch")
-sketch.AttachmentSupport = [(doc.getObject("FacePlatePad"), "Face6")]
-sketch.MapMode = "FlatFace"
-doc.recompute()
-pts = [FreeCAD.Vector(0,0,0), FreeCAD.Vector({p['W']},0,0),
-       FreeCAD.Vector({p['W']},{p['WT']},0), FreeCAD.Vector(0,{p['WT']},0)]
-for i in range(4):
-    sketch.addGeometry(Part.LineSegment(pts[i], pts[(i+1)%4]), False)
-for i in range(4):
-    sketch.addConstraint(Sketcher.Constraint("Coincident", i, 2, (i+1)%4, 1))
-doc.recompute()
-pad = body.newObject("PartDesign::Pad", "BottomWallPad")
-pad.Profile = sketch
-pad.Length = {p['SD']}
-pad.Refine = True
-doc.recompute()
-_result_ = {{"ok": True}}
-""")
-
-    # Top wall
-    top_y = RACK_1U_HEIGHT - WALL_THICKNESS
-    execute(proxy, f"""
-import Part, Sketcher
-doc = FreeCAD.ActiveDocument
-body = doc.getObject("CenterPanelBody")
-sketch = body.newObject("Sketcher::SketchObject", "TopWallSketch")
-sketch.AttachmentSupport = [(doc.getObject("FacePlatePad"), "Face6")]
-sketch.MapMode = "FlatFace"
-doc.recompute()
-pts = [FreeCAD.Vector(0,{top_y},0), FreeCAD.Vector({p['W']},{top_y},0),
-       FreeCAD.Vector({p['W']},{p['H']},0), FreeCAD.Vector(0,{p['H']},0)]
-for i in range(4):
-    sketch.addGeometry(Part.LineSegment(pts[i], pts[(i+1)%4]), False)
-for i in range(4):
-    sketch.addConstraint(Sketcher.Constraint("Coincident", i, 2, (i+1)%4, 1))
-doc.recompute()
-pad = body.newObject("PartDesign::Pad", "TopWallPad")
-pad.Profile = sketch
-pad.Length = {p['SD']}
-pad.Refine = True
-doc.recompute()
-_result_ = {{"ok": True}}
-""")
+"""
 
-    # Lip block (full face, reversed into -Z)
-    execute(proxy, f"""
-import Part, Sketcher
-doc = FreeCAD.ActiveDocument
-body = doc.getObject("CenterPanelBody")
-sketch = body.newObject("Sketcher::SketchObject", "LipBlockSketch")
-sketch.AttachmentSupport = [(body.Origin.getObject("XY_Plane"), "")]
-sketch.MapMode = "FlatFace"
-doc.recompute()
-pts = [FreeCAD.Vector(0,0,0), FreeCAD.Vector({p['W']},0,0),
-       FreeCAD.Vector({p['W']},{p['H']},0), FreeCAD.Vector(0,{p['H']},0)]
-for i in range(4):
-    sketch.addGeometry(Part.LineSegment(pts[i], pts[(i+1)%4]), False)
-for i in range(4):
-    sketch.addConstraint(Sketcher.Constraint("Coincident", i, 2, (i+1)%4, 1))
-doc.recompute()
-pad = body.newObject("PartDesign::Pad", "LipBlockPad")
-pad.Profile = sketch
-pad.Length = {p['LD']}
-pad.Reversed = True
-pad.Refine = True
-doc.recompute()
-_result_ = {{"ok": True}}
-""")
 
-    # Lip pocket (remove center to leave frame)
-    li = LIP_INSET
-    inner_w = PANEL_WIDTH - 2 * li
-    inner_h = RACK_1U_HEIGHT - 2 * li
-    execute(proxy, f"""
-import Part, Sketcher
-doc = FreeCAD.ActiveDocument
-body = doc.getObject("CenterPanelBody")
-sketch = body.newObject("Sketcher::SketchObject", "LipPocketSketch")
-sketch.AttachmentSupport = [(body.Origin.getObject("XY_Plane"), "")]
-sketch.MapMode = "FlatFace"
-sketch.AttachmentOffset = FreeCAD.Placement(
-    FreeCAD.Vector(0, 0, -{p['LD']}), FreeCAD.Rotation(0, 0, 0))
-doc.recompute()
-pts = [FreeCAD.Vector({li},{li},0), FreeCAD.Vector({li + inner_w},{li},0),
-       FreeCAD.Vector({li + inner_w},{li + inner_h},0), FreeCAD.Vector({li},{li + inner_h},0)]
-for i in range(4):
-    sketch.addGeometry(Part.LineSegment(pts[i], pts[(i+1)%4]), False)
-for i in range(4):
-    sketch.addConstraint(Sketcher.Constraint("Coincident", i, 2, (i+1)%4, 1))
-doc.recompute()
-pocket = body.newObject("PartDesign::Pocket", "LipPocket")
-pocket.Profile = sketch
-pocket.Length = {p['LD']}
-pocket.Reversed = False
-pocket.Refine = True
-doc.recompute()
-_result_ = {{"ok": True}}
-""")
+def center_panel_script():
+    """Steps 2-7: Build the complete center panel shape.
 
-    # Joint screw holes (through-all in Z) + hex nut recesses
+    The panel is fixed geometry, so it is built from Part primitives and
+    booleans rather than a PartDesign feature tree: no Sketcher solves. The
+    code only computes `shape`; run it through part_shape_script().
+    """
     hole_positions = []
     for y in JOINT_SCREW_Y_POSITIONS:
         hole_positions.append((JOINT_SCREW_X, y))
         hole_positions.append((PANEL_WIDTH - JOINT_SCREW_X, y))
-    hp_str = repr([(x, y) for x, y in hole_positions])
-
-    execute(proxy, f"""
-import Part, Sketcher, math
-doc = FreeCAD.ActiveDocument
-body = doc.getObject("CenterPanelBody")
-
-# Clearance holes
-sketch = body.newObject("Sketcher::SketchObject", "JointHolesSketch")
-sketch.AttachmentSupport = [(body.Origin.getObject("XY_Plane"), "")]
-sketch.MapMode = "FlatFace"
-doc.recompute()
-for x, y in {hp_str}:
-    sketch.addGeometry(Part.Circle(FreeCAD.Vector(x, y, 0), FreeCAD.Vector(0,0,1), {M3_CLEARANCE_RADIUS}), False)
-doc.recompute()
-pocket = body.newObject("PartDesign::Pocket", "JointHolesPocket")
-pocket.Profile = sketch
-pocket.Type = 1
-pocket.Refine = True
-doc.recompute()
-
-# Hex nut recesses on back face
-sketch_nut = body.newObject("Sketcher::SketchObject", "NutRecessSketch")
-sketch_nut.AttachmentSupport = [(doc.getObject("FacePlatePad"), "Face6")]
-sketch_nut.MapMode = "FlatFace"
-doc.recompute()
-hex_r = {HEX_CIRCUMRADIUS}
-for idx, (x, y) in enumerate({hp_str}):
-    for j in range(6):
-        a1 = math.radians(60 * j + 30)
-        a2 = math.radians(60 * (j + 1) + 30)
-        sketch_nut.addGeometry(Part.LineSegment(
-            FreeCAD.Vector(x + hex_r * math.cos(a1), y + hex_r * math.sin(a1), 0),
-            FreeCAD.Vector(x + hex_r * math.cos(a2), y + hex_r * math.sin(a2), 0)
-        ), False)
-    base = idx * 6
-    for j in range(6):
-        sketch_nut.addConstraint(Sketcher.Constraint("Coincident", base+j, 2, base+(j+1)%6, 1))
-doc.recompute()
-pocket_nut = body.newObject("PartDesign::Pocket", "NutRecessPocket")
-pocket_nut.Profile = sketch_nut
-pocket_nut.Length = {NUT_RECESS_DEPTH}
-pocket_nut.Reversed = False
-pocket_nut.Refine = True
-doc.recompute()
-_result_ = {{"ok": True}}
-""")
+    joint_holes = repr([(x, y, M3_CLEARANCE_RADIUS) for x, y in hole_positions])
+    hex_str = repr([[(x + dx, y + dy) for dx, dy in HEX_OFFSETS]
+                    for x, y in hole_positions])
 
     # Pi box face plate cutouts
     cl = CUTOUT_LIP
@@ -333,181 +206,119 @@ _result_ = {{"ok": True}}
         (BOX_RIGHT_X + cl, BOX_Y_START + cl,
          BOX_RIGHT_X + BOX_OPENING - cl, BOX_Y_END - cl),
     ]
-    execute(proxy, f"""
-import Part, Sketcher
+
+    return f"""
+W, H = {PANEL_WIDTH}, {RACK_1U_HEIGHT}
+FPT, WT, SD = {FACE_PLATE_THICKNESS}, {WALL_THICKNESS}, {SHELF_DEPTH}
+LD, LI = {LIP_DEPTH}, {LIP_INSET}
+
+# Top/bottom walls and lip frame, fused to the face plate below
+lip = Part.makeBox(W, H, LD, V(0, 0, -LD))
+lip = lip.cut(Part.makeBox(W - 2 * LI, H - 2 * LI, LD, V(LI, LI, -LD)))
+solids = [Part.makeBox(W, WT, SD, V(0, 0, FPT)),
+          Part.makeBox(W, WT, SD, V(0, H - WT, FPT)),
+          lip]
+
+# Fillets on wall-faceplate inside corners: the corners run the full panel
+# width, so each is added as an r x r strip minus the fillet cylinder
+r = {WALL_FILLET_RADIUS}
+for wall_y, inward in ((WT, 1), (H - WT, -1)):
+    strip = Part.makeBox(W, r, r, V(0, min(wall_y, wall_y + inward * r), FPT))
+    arc = Part.makeCylinder(r, W + 2, V(-1, wall_y + inward * r, FPT + r), V(1, 0, 0))
+    solids.append(strip.cut(arc))
+
+# Face plate fused with everything in one boolean
+shape = Part.makeBox(W, H, FPT).fuse(solids)
+
+# Joint screw clearance holes + hex nut recesses on back face
+shape = shape.cut(Part.makeCompound(z_cylinders({joint_holes}, -LD - 1, LD + FPT + 2)))
+shape = shape.cut(Part.makeCompound([
+    polygon_prism([(x, y, FPT - {NUT_RECESS_DEPTH}) for x, y in hex_pts],
+                  V(0, 0, {NUT_RECESS_DEPTH} + 1))
+    for hex_pts in {hex_str}]))
+
+# Pi box face plate cutouts
+shape = shape.cut(Part.makeCompound([
+    Part.makeBox(x2 - x1, y2 - y1, LD + FPT + 2, V(x1, y1, -LD - 1))
+    for x1, y1, x2, y2 in {cuts}]))
+shape = shape.removeSplitter()
+"""
+
+
+def part_shape_script(name, shape_code, brep_dir=None):
+    """Return FreeCAD code that runs shape_code and adds `shape` as a Part::Feature.
+
+    shape_code must only compute `shape` (pure OCCT work, no document access).
+
+    With brep_dir, the finished shape is baked to a BRep file named after a
+    SHA-256 of shape_code (and the shared helpers), and later runs with
+    identical code load that file instead of rebuilding. A bake that fails to
+    load or is not a valid shape is rebuilt.
+    """
+    brep_path = ""
+    if brep_dir:
+        # The helpers are part of the geometry, so they are part of the key
+        digest = hashlib.sha256((_FREECAD_HELPERS + shape_code).encode()).hexdigest()[:16]
+        brep_path = os.path.join(brep_dir, f"{name}-{digest}.brep")
+    return f"""
+brep_path = {brep_path!r}
+shape = None
+if brep_path and os.path.isfile(brep_path):
+    shape = Part.Shape()
+    try:
+        shape.importBrep(brep_path)
+    except Exception:
+        shape = None
+    # A damaged bake is rebuilt (and overwritten) rather than trusted
+    if shape is not None and (shape.isNull() or not shape.isValid()):
+        shape = None
+if shape is None:
+{textwrap.indent(shape_code, '    ')}
+    if brep_path:
+        # Write then rename, so an interrupted export never leaves a
+        # truncated file at the content-addressed path
+        os.makedirs(os.path.dirname(brep_path), exist_ok=True)
+        shape.exportBrep(brep_path + ".tmp")
+        os.replace(brep_path + ".tmp", brep_path)
 doc = FreeCAD.ActiveDocument
-body = doc.getObject("CenterPanelBody")
-sketch = body.newObject("Sketcher::SketchObject", "BoxCutoutSketch")
-sketch.AttachmentSupport = [(body.Origin.getObject("XY_Plane"), "")]
-sketch.MapMode = "FlatFace"
-sketch.AttachmentOffset = FreeCAD.Placement(
-    FreeCAD.Vector(0, 0, -{LIP_DEPTH}), FreeCAD.Rotation(0, 0, 0))
-doc.recompute()
-cuts = {cuts}
-for ci, (x1, y1, x2, y2) in enumerate(cuts):
-    base = ci * 4
-    pts = [FreeCAD.Vector(x1,y1,0), FreeCAD.Vector(x2,y1,0),
-           FreeCAD.Vector(x2,y2,0), FreeCAD.Vector(x1,y2,0)]
-    for i in range(4):
-        sketch.addGeometry(Part.LineSegment(pts[i], pts[(i+1)%4]), False)
-    for i in range(4):
-        sketch.addConstraint(Sketcher.Constraint("Coincident", base+i, 2, base+(i+1)%4, 1))
-doc.recompute()
-pocket = body.newObject("PartDesign::Pocket", "BoxCutoutPocket")
-pocket.Profile = sketch
-pocket.Type = 1
-pocket.Reversed = True
-pocket.Refine = True
-doc.recompute()
+obj = doc.addObject("Part::Feature", "{name}")
+obj.Label = "{name}"
+obj.Shape = shape
 _result_ = {{"ok": True}}
-""")
+"""
 
-    # Fillets on wall-faceplate inside corners
-    execute(proxy, f"""
-doc = FreeCAD.ActiveDocument
-body = doc.getObject("CenterPanelBody")
-tip = body.Tip
-shape = tip.Shape
-fillet_edges = []
-for i, edge in enumerate(shape.Edges):
-    v1 = edge.Vertexes[0].Point
-    v2 = edge.Vertexes[1].Point
-    # Bottom wall junction: y≈{WALL_THICKNESS}, z≈{FACE_PLATE_THICKNESS}
-    if (abs(v1.y - {WALL_THICKNESS}) < 0.1 and abs(v2.y - {WALL_THICKNESS}) < 0.1 and
-        abs(v1.z - {FACE_PLATE_THICKNESS}) < 0.1 and abs(v2.z - {FACE_PLATE_THICKNESS}) < 0.1 and
-        edge.Length > 20):
-        fillet_edges.append(f"Edge{{i+1}}")
-    # Top wall junction: y≈{RACK_1U_HEIGHT - WALL_THICKNESS}, z≈{FACE_PLATE_THICKNESS}
-    if (abs(v1.y - {RACK_1U_HEIGHT - WALL_THICKNESS}) < 0.1 and abs(v2.y - {RACK_1U_HEIGHT - WALL_THICKNESS}) < 0.1 and
-        abs(v1.z - {FACE_PLATE_THICKNESS}) < 0.1 and abs(v2.z - {FACE_PLATE_THICKNESS}) < 0.1 and
-        edge.Length > 20):
-        fillet_edges.append(f"Edge{{i+1}}")
-
-if fillet_edges:
-    fillet = body.newObject("PartDesign::Fillet", "WallFillets")
-    fillet.Base = (tip, fillet_edges)
-    fillet.Radius = {WALL_FILLET_RADIUS}
-    doc.recompute()
-_result_ = {{"fillets": len(fillet_edges)}}
-""")
-
-    print("  Center panel complete.")
-
-
-def add_wall_slots(proxy):
+
+def wall_slots_script():
     """Add side bar retention slots to top and bottom walls of center panel."""
     slot_x_str = repr(WALL_SLOT_X_CENTERS)
-    execute(proxy, f"""
-import Part, Sketcher
+    return f"""
 doc = FreeCAD.ActiveDocument
-body = doc.getObject("CenterPanelBody")
-tip = body.Tip
-
-# Find top outer face (Y=44.45, normal +Y, full panel extent)
-top_face = None
-for i, face in enumerate(tip.Shape.Faces):
-    normal = face.normalAt(0, 0)
-    if abs(normal.y - 1.0) < 0.01:
-        bb = face.BoundBox
-        if abs(bb.YMin - {RACK_1U_HEIGHT}) < 0.01 and bb.XMax - bb.XMin > 200:
-            top_face = f"Face{{i+1}}"
-            break
-
-# Create sketch on top outer face
-# UV mapping: u_axis = -X, v_axis = +Z, origin at (0, 44.45, 0)
-sketch = body.newObject("Sketcher::SketchObject", "TopSlotSketch")
-sketch.AttachmentSupport = [(tip, top_face)]
-sketch.MapMode = "FlatFace"
-doc.recompute()
+panel = doc.getObject("CenterPanelBody")
 
 slot_length = {WALL_SLOT_LENGTH}
 slot_width = {WALL_SLOT_WIDTH}
 z_center = {WALL_SLOT_Z_CENTER}
+h = {RACK_1U_HEIGHT}
+
+# One box per slot, through both walls in Y
+slots = [Part.makeBox(slot_length, h + 2, slot_width,
+                      V(gx - slot_length / 2, -1, z_center - slot_width / 2))
+         for gx in {slot_x_str}]
+panel.Shape = panel.Shape.cut(Part.Compound(slots)).removeSplitter()
+_result_ = {{"slots": len(slots)}}
+"""
 
-for gx in {slot_x_str}:
-    # Convert global X to sketch u (u = -global_x)
-    su_left = -(gx + slot_length / 2)
-    su_right = su_left + slot_length
-    sv_bottom = z_center - slot_width / 2
-    sv_top = sv_bottom + slot_width
-
-    g0 = sketch.addGeometry(Part.LineSegment(
-        FreeCAD.Vector(su_left, sv_bottom, 0), FreeCAD.Vector(su_right, sv_bottom, 0)))
-    g1 = sketch.addGeometry(Part.LineSegment(
-        FreeCAD.Vector(su_right, sv_bottom, 0), FreeCAD.Vector(su_right, sv_top, 0)))
-    g2 = sketch.addGeometry(Part.LineSegment(
-        FreeCAD.Vector(su_right, sv_top, 0), FreeCAD.Vector(su_left, sv_top, 0)))
-    g3 = sketch.addGeometry(Part.LineSegment(
-        FreeCAD.Vector(su_left, sv_top, 0), FreeCAD.Vector(su_left, sv_bottom, 0)))
-
-    sketch.addConstraint(Sketcher.Constraint("Coincident", g0, 2, g1, 1))
-    sketch.addConstraint(Sketcher.Constraint("Coincident", g1, 2, g2, 1))
-    sketch.addConstraint(Sketcher.Constraint("Coincident", g2, 2, g3, 1))
-    sketch.addConstraint(Sketcher.Constraint("Coincident", g3, 2, g0, 1))
-
-    sketch.addConstraint(Sketcher.Constraint("Horizontal", g0))
-    sketch.addConstraint(Sketcher.Constraint("Horizontal", g2))
-    sketch.addConstraint(Sketcher.Constraint("Vertical", g1))
-    sketch.addConstraint(Sketcher.Constraint("Vertical", g3))
-
-    sketch.addConstraint(Sketcher.Constraint("DistanceX", g0, 1, g0, 2, slot_length))
-    sketch.addConstraint(Sketcher.Constraint("DistanceY", g1, 1, g1, 2, slot_width))
-
-    sketch.addConstraint(Sketcher.Constraint("DistanceX", -1, 1, g0, 1, su_left))
-    sketch.addConstraint(Sketcher.Constraint("DistanceY", -1, 1, g0, 1, sv_bottom))
-
-doc.recompute()
-
-# ThroughAll pocket from top face cuts through both top and bottom walls
-pocket = body.newObject("PartDesign::Pocket", "TopSlotPocket")
-pocket.Profile = sketch
-pocket.Type = 1
-pocket.Refine = True
-doc.recompute()
-_result_ = {{"slots": len({slot_x_str}), "fully_constrained": sketch.FullyConstrained}}
-""")
-    print("  Wall slots complete.")
-
-
-def build_side_bar(proxy):
-    """Build the side bar body (print 4 copies)."""
-    execute(proxy, f"""
-import Part, Sketcher, math
-doc = FreeCAD.ActiveDocument
-body = doc.addObject("PartDesign::Body", "SideBarBody")
-body.Label = "SideBarBody"
-doc.recompute()
 
-# Base sketch on XY plane
-sketch = body.newObject("Sketcher::SketchObject", "SideBarBaseSketch")
-sketch.AttachmentSupport = [(body.Origin.getObject("XY_Plane"), "")]
-sketch.MapMode = "FlatFace"
-doc.recompute()
+def side_bar_script():
+    """Build the side bar shape (print 4 copies).
 
+    The block, nut traps and screw holes are polygon prisms and cylinders cut
+    directly; no sketches. The code only computes `shape`; run it through
+    part_shape_script().
+    """
+    return f"""
 w = {SIDEBAR_WIDTH}
 h = {SIDEBAR_HEIGHT}
-g0 = sketch.addGeometry(Part.LineSegment(FreeCAD.Vector(0,0,0), FreeCAD.Vector(w,0,0)))
-g1 = sketch.addGeometry(Part.LineSegment(FreeCAD.Vector(w,0,0), FreeCAD.Vector(w,h,0)))
-g2 = sketch.addGeometry(Part.LineSegment(FreeCAD.Vector(w,h,0), FreeCAD.Vector(0,h,0)))
-g3 = sketch.addGeometry(Part.LineSegment(FreeCAD.Vector(0,h,0), FreeCAD.Vector(0,0,0)))
-sketch.addConstraint(Sketcher.Constraint("Coincident", g0, 2, g1, 1))
-sketch.addConstraint(Sketcher.Constraint("Coincident", g1, 2, g2, 1))
-sketch.addConstraint(Sketcher.Constraint("Coincident", g2, 2, g3, 1))
-sketch.addConstraint(Sketcher.Constraint("Coincident", g3, 2, g0, 1))
-sketch.addConstraint(Sketcher.Constraint("Horizontal", g0))
-sketch.addConstraint(Sketcher.Constraint("Horizontal", g2))
-sketch.addConstraint(Sketcher.Constraint("Vertical", g1))
-sketch.addConstraint(Sketcher.Constraint("Vertical", g3))
-sketch.addConstraint(Sketcher.Constraint("DistanceX", g0, 1, g0, 2, w))
-sketch.addConstraint(Sketcher.Constraint("DistanceY", g1, 1, g1, 2, h))
-sketch.addConstraint(Sketcher.Constraint("Coincident", g0, 1, -1, 1))
-doc.recompute()
-
-pad = body.newObject("PartDesign::Pad", "SideBarPad")
-pad.Profile = sketch
-pad.Length = {SIDEBAR_DEPTH}
-pad.Refine = True
-doc.recompute()
 
 # Square nut traps on top and bottom faces (slide-in from Z=0 edge)
 # Nut pocket is recessed below the surface with a retaining layer + screw hole
@@ -525,257 +336,181 @@ x_max = cx_bar + half_nut  # 6.9mm
 z_min = 0.0                # Open edge (nut slides in from here)
 z_max = cz_bar + half_nut  # 8.9mm (closed end)
 
-def find_y_face(body_obj, label, bar_h):
-    for fi, face in enumerate(body_obj.Tip.Shape.Faces):
-        n = face.normalAt(0, 0)
-        bb = face.BoundBox
-        if label == "Top" and abs(n.y - 1.0) < 0.01 and abs(bb.YMin - bar_h) < 0.01:
-            return f"Face{{fi+1}}"
-        if label == "Bottom" and abs(n.y + 1.0) < 0.01 and abs(bb.YMax) < 0.01:
-            return f"Face{{fi+1}}"
-    return None
-
-def get_u_flip(sketch_obj):
-    p = sketch_obj.getGlobalPlacement()
-    u = p.Rotation.multVec(FreeCAD.Vector(1, 0, 0))
-    return abs(u.x + 1.0) < 0.01
-
-for face_label in ["Top", "Bottom"]:
-    # --- Nut pocket (recessed below surface by retaining layer) ---
-    fn = find_y_face(body, face_label, h)
-    sk = body.newObject("Sketcher::SketchObject", f"{{face_label}}NutTrapSketch")
-    sk.AttachmentSupport = [(body.Tip, fn)]
-    sk.MapMode = "FlatFace"
-    sk.AttachmentOffset = FreeCAD.Placement(
-        FreeCAD.Vector(0, 0, -retaining), FreeCAD.Rotation(0, 0, 0))
-    doc.recompute()
-
-    if get_u_flip(sk):
-        su_min, su_max = -x_max, -x_min
-    else:
-        su_min, su_max = x_min, x_max
-    sv_min, sv_max = z_min, z_max
-
-    pts = [FreeCAD.Vector(su_min, sv_min, 0), FreeCAD.Vector(su_max, sv_min, 0),
-           FreeCAD.Vector(su_max, sv_max, 0), FreeCAD.Vector(su_min, sv_max, 0)]
-    for i in range(4):
-        sk.addGeometry(Part.LineSegment(pts[i], pts[(i+1)%4]), False)
-    for i in range(4):
-        sk.addConstraint(Sketcher.Constraint("Coincident", i, 2, (i+1)%4, 1))
-    doc.recompute()
-
-    pocket = body.newObject("PartDesign::Pocket", f"{{face_label}}NutTrapPocket")
-    pocket.Profile = sk
-    pocket.Length = nut_pocket_d
-    pocket.Refine = True
-    doc.recompute()
-
-    # --- Screw access hole (through retaining layer to reach nut) ---
-    fn2 = find_y_face(body, face_label, h)
-    sk2 = body.newObject("Sketcher::SketchObject", f"{{face_label}}ScrewHoleSketch")
-    sk2.AttachmentSupport = [(body.Tip, fn2)]
-    sk2.MapMode = "FlatFace"
-    doc.recompute()
-
-    if get_u_flip(sk2):
-        su_c = -cx_bar
-    else:
-        su_c = cx_bar
-    sv_c = cz_bar
-
-    sk2.addGeometry(Part.Circle(
-        FreeCAD.Vector(su_c, sv_c, 0), FreeCAD.Vector(0, 0, 1), screw_r), False)
-    doc.recompute()
-
-    pocket2 = body.newObject("PartDesign::Pocket", f"{{face_label}}ScrewHolePocket")
-    pocket2.Profile = sk2
-    pocket2.Length = retaining
-    pocket2.Refine = True
-    doc.recompute()
-
-_result_ = {{"ok": True, "volume": round(body.Tip.Shape.Volume, 2)}}
-""")
-    print("  Side bar complete (print 4 copies).")
-
-
-def build_left_tab(proxy):
-    """Steps 8-10: Build the left end tab."""
+shape = polygon_prism([(0, 0, 0), (w, 0, 0), (w, h, 0), (0, h, 0)],
+                      V(0, 0, {SIDEBAR_DEPTH}))
+
+# inward is the Y direction pointing into the bar from each face; both
+# faces' cutters are removed in a single boolean. Each hole starts on its
+# trap's face, so the tools are passed as separate arguments rather than one
+# (self-touching) compound.
+cutters = []
+for face_y, inward in [(h, -1), (0.0, 1)]:
+    # Nut pocket, recessed below the surface by the retaining layer
+    y = face_y + inward * retaining
+    trap = polygon_prism([(x_min, y, z_min), (x_max, y, z_min),
+                          (x_max, y, z_max), (x_min, y, z_max)],
+                         V(0, inward * nut_pocket_d, 0))
+    # Screw access hole, out through the retaining layer (1 mm overshoot)
+    hole = Part.makeCylinder(screw_r, retaining + 1, V(cx_bar, y, cz_bar), V(0, -inward, 0))
+    cutters += [trap, hole]
+shape = shape.cut(cutters)
+
+shape = shape.removeSplitter()
+"""
+
+
+def left_tab_script():
+    """Steps 8-10: Build the left end tab shape.
+
+    Profiles are closed polygon faces extruded and cut directly, without
+    Sketcher. The code only computes `shape`; run it through part_shape_script().
+    """
     li = LIP_INSET
     top_y = RACK_1U_HEIGHT - li
     rail_x = -TAB_RAIL_WIDTH
 
     # L-shaped tab profile
     pts_str = repr([
-        (rail_x, 0), (0, 0), (0, li),
-        (TAB_OVERLAP_WIDTH, li), (TAB_OVERLAP_WIDTH, top_y),
-        (0, top_y), (0, RACK_1U_HEIGHT), (rail_x, RACK_1U_HEIGHT),
+        (rail_x, 0, 0), (0, 0, 0), (0, li, 0),
+        (TAB_OVERLAP_WIDTH, li, 0), (TAB_OVERLAP_WIDTH, top_y, 0),
+        (0, top_y, 0), (0, RACK_1U_HEIGHT, 0), (rail_x, RACK_1U_HEIGHT, 0),
+    ])
+    groove_str = repr([
+        (0, li, 0), (TAB_LIP_GROOVE_WIDTH, li, 0),
+        (TAB_LIP_GROOVE_WIDTH, top_y, 0), (0, top_y, 0),
     ])
 
-    execute(proxy, f"""
-import Part, Sketcher
-doc = FreeCAD.ActiveDocument
-tab_body = doc.addObject("PartDesign::Body", "LeftTabBody")
-tab_body.Label = "LeftTabBody"
-doc.recompute()
-sketch = tab_body.newObject("Sketcher::SketchObject", "TabProfileSketch")
-sketch.AttachmentSupport = [(tab_body.Origin.getObject("XY_Plane"), "")]
-sketch.MapMode = "FlatFace"
-doc.recompute()
-pts_raw = {pts_str}
-pts = [FreeCAD.Vector(x, y, 0) for x, y in pts_raw]
-n = len(pts)
-for i in range(n):
-    sketch.addGeometry(Part.LineSegment(pts[i], pts[(i+1)%n]), False)
-for i in range(n):
-    sketch.addConstraint(Sketcher.Constraint("Coincident", i, 2, (i+1)%n, 1))
-doc.recompute()
-pad = tab_body.newObject("PartDesign::Pad", "TabPad")
-pad.Profile = sketch
-pad.Length = {TAB_DEPTH}
-pad.Reversed = True
-pad.Refine = True
-doc.recompute()
-_result_ = {{"ok": True}}
-""")
-
-    # Lip groove pocket
-    execute(proxy, f"""
-import Part, Sketcher
-doc = FreeCAD.ActiveDocument
-tab_body = doc.getObject("LeftTabBody")
-sketch = tab_body.newObject("Sketcher::SketchObject", "LipPocketSketch001")
-sketch.AttachmentSupport = [(tab_body.Origin.getObject("XY_Plane"), "")]
-sketch.MapMode = "FlatFace"
-doc.recompute()
-pts = [FreeCAD.Vector(0,{li},0), FreeCAD.Vector({TAB_LIP_GROOVE_WIDTH},{li},0),
-       FreeCAD.Vector({TAB_LIP_GROOVE_WIDTH},{top_y},0), FreeCAD.Vector(0,{top_y},0)]
-for i in range(4):
-    sketch.addGeometry(Part.LineSegment(pts[i], pts[(i+1)%4]), False)
-for i in range(4):
-    sketch.addConstraint(Sketcher.Constraint("Coincident", i, 2, (i+1)%4, 1))
-doc.recompute()
-pocket = tab_body.newObject("PartDesign::Pocket", "LipGroovePocket")
-pocket.Profile = sketch
-pocket.Length = {TAB_LIP_GROOVE_DEPTH}
-pocket.Reversed = False
-pocket.Refine = True
-doc.recompute()
-_result_ = {{"ok": True}}
-""")
-
-    # EIA-310 rail holes
+    # EIA-310 rail holes and joint screw clearance holes (through), counterbores
     rail_cx = RAIL_HOLE_X_CENTER
-    execute(proxy, f"""
-import Part, Sketcher
-doc = FreeCAD.ActiveDocument
-tab_body = doc.getObject("LeftTabBody")
-sketch = tab_body.newObject("Sketcher::SketchObject", "RailHolesSketch")
-sketch.AttachmentSupport = [(tab_body.Origin.getObject("XY_Plane"), "")]
-sketch.MapMode = "FlatFace"
-sketch.AttachmentOffset = FreeCAD.Placement(
-    FreeCAD.Vector(0, 0, -{TAB_DEPTH}), FreeCAD.Rotation(0, 0, 0))
-doc.recompute()
-sketch.addGeometry(Part.Circle(FreeCAD.Vector({rail_cx}, {RAIL_HOLE_CENTER_Y - RAIL_HOLE_SPACING}, 0), FreeCAD.Vector(0,0,1), {RAIL_HOLE_OUTER_DIA/2}), False)
-sketch.addGeometry(Part.Circle(FreeCAD.Vector({rail_cx}, {RAIL_HOLE_CENTER_Y}, 0), FreeCAD.Vector(0,0,1), {RAIL_HOLE_CENTER_DIA/2}), False)
-sketch.addGeometry(Part.Circle(FreeCAD.Vector({rail_cx}, {RAIL_HOLE_CENTER_Y + RAIL_HOLE_SPACING}, 0), FreeCAD.Vector(0,0,1), {RAIL_HOLE_OUTER_DIA/2}), False)
-doc.recompute()
-pocket = tab_body.newObject("PartDesign::Pocket", "RailHolesPocket")
-pocket.Profile = sketch
-pocket.Type = 1
-pocket.Refine = True
-doc.recompute()
-_result_ = {{"ok": True}}
-""")
-
-    # Joint screw clearance holes + counterbores
     jx = JOINT_SCREW_X
-    jy_str = repr(JOINT_SCREW_Y_POSITIONS)
-    execute(proxy, f"""
-import Part, Sketcher
-doc = FreeCAD.ActiveDocument
-tab_body = doc.getObject("LeftTabBody")
-
-# Clearance holes
-sketch = tab_body.newObject("Sketcher::SketchObject", "TabJointClearSketch")
-sketch.AttachmentSupport = [(tab_body.Origin.getObject("XY_Plane"), "")]
-sketch.MapMode = "FlatFace"
-doc.recompute()
-for y in {jy_str}:
-    sketch.addGeometry(Part.Circle(FreeCAD.Vector({jx}, y, 0), FreeCAD.Vector(0,0,1), {M3_CLEARANCE_RADIUS}), False)
-doc.recompute()
-pocket = tab_body.newObject("PartDesign::Pocket", "TabJointClearPocket")
-pocket.Profile = sketch
-pocket.Type = 1
-pocket.Refine = True
-doc.recompute()
-
-# Counterbores
-sketch_cb = tab_body.newObject("Sketcher::SketchObject", "TabCounterboreSketch")
-sketch_cb.AttachmentSupport = [(tab_body.Origin.getObject("XY_Plane"), "")]
-sketch_cb.MapMode = "FlatFace"
-sketch_cb.AttachmentOffset = FreeCAD.Placement(
-    FreeCAD.Vector(0, 0, -{TAB_DEPTH}), FreeCAD.Rotation(0, 0, 0))
-doc.recompute()
-for y in {jy_str}:
-    sketch_cb.addGeometry(Part.Circle(FreeCAD.Vector({jx}, y, 0), FreeCAD.Vector(0,0,1), {COUNTERBORE_RADIUS}), False)
-doc.recompute()
-pocket_cb = tab_body.newObject("PartDesign::Pocket", "TabCounterborePocket")
-pocket_cb.Profile = sketch_cb
-pocket_cb.Length = {COUNTERBORE_DEPTH}
-pocket_cb.Reversed = False
-pocket_cb.Refine = True
-doc.recompute()
-_result_ = {{"ok": True}}
-""")
+    through_holes = repr(
+        [(rail_cx, RAIL_HOLE_CENTER_Y - RAIL_HOLE_SPACING, RAIL_HOLE_OUTER_DIA / 2),
+         (rail_cx, RAIL_HOLE_CENTER_Y, RAIL_HOLE_CENTER_DIA / 2),
+         (rail_cx, RAIL_HOLE_CENTER_Y + RAIL_HOLE_SPACING, RAIL_HOLE_OUTER_DIA / 2)]
+        + [(jx, y, M3_CLEARANCE_RADIUS) for y in JOINT_SCREW_Y_POSITIONS])
+    counterbores = repr([(jx, y, COUNTERBORE_RADIUS) for y in JOINT_SCREW_Y_POSITIONS])
 
-    print("  Left tab complete.")
+    return f"""
+depth = {TAB_DEPTH}
+
+shape = polygon_prism({pts_str}, V(0, 0, -depth))
+
+# Lip groove, rail holes, clearance holes and counterbores in one boolean.
+# The counterbores overlap the clearance holes, so the tools are passed as
+# separate arguments rather than one compound.
+tools = [polygon_prism({groove_str}, V(0, 0, -{TAB_LIP_GROOVE_DEPTH}))]
+tools += z_cylinders({through_holes}, -depth - 1, depth + 2)
+# Counterbores are recessed {COUNTERBORE_DEPTH} mm into the tab face (Z=-depth) for the
+# screw heads, as in the original PartDesign build (printed_files/LeftTab.stl)
+tools += z_cylinders({counterbores}, -depth - 1, {COUNTERBORE_DEPTH} + 1)
+shape = shape.cut(tools).removeSplitter()
+"""
 
 
-def build_right_tab(proxy):
+def right_tab_script():
     """Step 11: Mirror left tab to create right tab."""
-    execute(proxy, f"""
+    return f"""
 doc = FreeCAD.ActiveDocument
-left_tab = doc.getObject("LeftTabBody")
-left_shape = left_tab.Shape.copy()
-mirror_matrix = FreeCAD.Matrix()
-mirror_matrix.A11 = -1
-mirror_matrix.A14 = {PANEL_WIDTH}
-mirrored_shape = left_shape.transformGeometry(mirror_matrix)
-right_tab = doc.addObject("Part::Feature", "RightTabBody")
-right_tab.Shape = mirrored_shape
+right_tab = doc.addObject("Part::Mirroring", "RightTabBody")
+right_tab.Source = doc.getObject("LeftTabBody")
+right_tab.Normal = V(1, 0, 0)
+right_tab.Base = V({PANEL_WIDTH / 2}, 0, 0)
 right_tab.Label = "RightTabBody"
 doc.recompute()
 _result_ = {{"ok": True}}
-""")
-    print("  Right tab (mirrored) complete.")
+"""
+
 
+def export_stls_script(output_dir, merged=False):
+    """Export all parts as STL files.
 
-def export_stls(proxy, output_dir):
-    """Export all parts as STL files."""
-    execute(proxy, f"""
-import MeshPart
+    The right tab is not tessellated: its mesh is the left tab's mesh
+    reflected across the panel's centre plane. With merged=True the
+    meshes are combined and written once as RackPanel.stl (a preview; parts
+    stay in model position). The mesh modules are only imported here, so
+    --no-export runs never load them.
+    """
+    return f"""
+import Mesh, MeshPart
 doc = FreeCAD.ActiveDocument
 output_dir = "{output_dir}"
-for name, label in [("CenterPanelBody", "CenterPanel"),
-                     ("LeftTabBody", "LeftTab"),
-                     ("RightTabBody", "RightTab"),
-                     ("SideBarBody", "SideBar")]:
-    obj = doc.getObject(name)
-    mesh = MeshPart.meshFromShape(Shape=obj.Shape, LinearDeflection=0.1, AngularDeflection=0.5)
-    mesh.write(f"{{output_dir}}/{{label}}.stl")
-_result_ = {{"exported": 4}}
-""")
-    print(f"  STLs exported to {output_dir}")
-
-
-def save_document(proxy, filepath):
+parts = {EXPORT_PARTS!r}
+
+def mesh_part(name):
+    return MeshPart.meshFromShape(Shape=doc.getObject(name).Shape,
+                                  LinearDeflection={STL_LINEAR_DEFLECTION},
+                                  AngularDeflection={STL_ANGULAR_DEFLECTION})
+
+def mirror_mesh(mesh):
+    mirror_matrix = FreeCAD.Matrix()
+    mirror_matrix.A11 = -1
+    mirror_matrix.A14 = {PANEL_WIDTH}  # Reflect across X = PANEL_WIDTH / 2
+    mirrored = mesh.copy()
+    mirrored.transform(mirror_matrix)
+    mirrored.flipNormals()  # Reflection reverses facet winding
+    return mirrored
+
+meshes = {{name: mesh_part(name) for name, _ in parts if name != "RightTabBody"}}
+meshes["RightTabBody"] = mirror_mesh(meshes["LeftTabBody"])
+if {merged}:
+    out = Mesh.Mesh()
+    for name, _ in parts:
+        out.addMesh(meshes[name])
+    out.write(f"{{output_dir}}/RackPanel.stl")
+else:
+    for name, label in parts:
+        meshes[name].write(f"{{output_dir}}/{{label}}.stl")
+_result_ = {{"exported": len(parts)}}
+"""
+
+
+def save_document_script(filepath):
     """Save the FreeCAD document."""
-    execute(proxy, f"""
+    return f"""
 doc = FreeCAD.ActiveDocument
 doc.saveAs("{filepath}")
 _result_ = {{"saved": doc.FileName}}
-""")
-    print(f"  Document saved to {filepath}")
+"""
+
+
+# ─── Output cache ────────────────────────────────────────────────────────────
+
+def script_signature(scripts):
+    """SHA-256 of the exact FreeCAD scripts a run would send.
+
+    Every parameter is interpolated into the scripts, so this changes exactly
+    when the generated geometry (or an output path) does.
+    """
+    h = hashlib.sha256()
+    for script in scripts:
+        h.update(script.encode())
+    return h.hexdigest()[:16]
+
+
+def cached_files(cache_dir, output_dir, fcstd_path):
+    """Return (cached, destination) pairs for the STLs and the FCStd."""
+    pairs = [(os.path.join(cache_dir, f"{label}.stl"),
+              os.path.join(output_dir, f"{label}.stl"))
+             for _, label in EXPORT_PARTS]
+    pairs.append((os.path.join(cache_dir, os.path.basename(fcstd_path)), fcstd_path))
+    return pairs
+
+
+def restore_from_cache(cache_dir, output_dir, fcstd_path):
+    """Copy cached outputs to their destinations; False if any are missing."""
+    pairs = cached_files(cache_dir, output_dir, fcstd_path)
+    if not all(os.path.isfile(src) for src, _ in pairs):
+        return False
+    for src, dst in pairs:
+        shutil.copyfile(src, dst)
+    return True
+
+
+def store_in_cache(cache_dir, output_dir, fcstd_path):
+    """Copy freshly generated outputs into the cache directory."""
+    os.makedirs(cache_dir, exist_ok=True)
+    for dst, src in cached_files(cache_dir, output_dir, fcstd_path):
+        shutil.copyfile(src, dst)
 
 
 # ─── Main ────────────────────────────────────────────────────────────────────
@@ -790,11 +525,45 @@ def main():
                         help='Path for FreeCAD document')
     parser.add_argument('--no-export', action='store_true',
                         help='Skip STL export')
+    parser.add_argument('--merged-stl', action='store_true',
+                        help='Write all parts to a single RackPanel.stl preview')
     parser.add_argument('--port', type=int, default=9875,
                         help='FreeCAD XML-RPC port')
+    parser.add_argument('--gzip', action='store_true',
+                        help='Gzip-compress requests to the XML-RPC bridge')
+    parser.add_argument('--use-cache', action='store_true',
+                        help='Reuse cached outputs and baked BReps from earlier runs')
     args = parser.parse_args()
 
-    proxy = xmlrpc.client.ServerProxy(f'http://localhost:{args.port}')
+    # The panel, tab and side bar shapes are pure OCCT booleans, built in turn
+    # within the batch (or loaded from baked BReps)
+    brep_dir = os.path.join(args.output_dir, '.cache', 'brep') if args.use_cache else None
+    steps = [
+        ("Creating document", create_document_script()),
+        ("Building center panel",
+         part_shape_script("CenterPanelBody", center_panel_script(), brep_dir)),
+        ("Building left end tab",
+         part_shape_script("LeftTabBody", left_tab_script(), brep_dir)),
+        ("Building side bar (print 4x)",
+         part_shape_script("SideBarBody", side_bar_script(), brep_dir)),
+        ("Adding side bar retention slots", wall_slots_script()),
+        ("Building right end tab (mirror)", right_tab_script()),
+        ("Saving document", save_document_script(args.fcstd_path)),
+    ]
+    if not args.no_export:
+        steps.append(("Exporting STLs",
+                      export_stls_script(args.output_dir, merged=args.merged_stl)))
+
+    use_cache = args.use_cache and not (args.no_export or args.merged_stl)
+    scripts = [script for _, script in steps]
+    cache_dir = os.path.join(args.output_dir, '.cache', script_signature(scripts))
+    if use_cache and restore_from_cache(cache_dir, args.output_dir, args.fcstd_path):
+        print(f"Scripts unchanged; restored outputs from {cache_dir}")
+        return
+
+    transport = GzipTransport() if args.gzip else None
+    proxy = xmlrpc.client.ServerProxy(f'http://localhost:{args.port}',
+                                      transport=transport)
 
     # Verify connection
     try:
@@ -808,30 +577,18 @@ def main():
     print(f"  Panel: {PANEL_WIDTH}x{RACK_1U_HEIGHT}mm, depth {TOTAL_DEPTH}mm")
     print(f"  Tabs: {TAB_TOTAL_WIDTH}x{RACK_1U_HEIGHT}x{TAB_DEPTH}mm")
 
-    print("\n1. Creating document...")
-    create_document(proxy)
-
-    print("2. Building center panel...")
-    build_center_panel(proxy)
-
-    print("3. Adding side bar retention slots...")
-    add_wall_slots(proxy)
+    # The whole recipe is compiled and run by FreeCAD in a single call, so
+    # progress is only known once it returns
+    print(f"\nBuilding in FreeCAD ({len(steps)} steps)...")
+    results = execute_many(proxy, scripts)
+    for i, ((label, _), result) in enumerate(zip(steps, results), 1):
+        print(f"{i}. {label}: {result}")
 
-    print("4. Building side bar (print 4x)...")
-    build_side_bar(proxy)
+    if use_cache:
+        store_in_cache(cache_dir, args.output_dir, args.fcstd_path)
 
-    print("5. Building left end tab...")
-    build_left_tab(proxy)
-
-    print("6. Building right end tab (mirror)...")
-    build_right_tab(proxy)
-
-    print("7. Saving document...")
-    save_document(proxy, args.fcstd_path)
-
-    if not args.no_export:
-        print("8. Exporting STLs...")
-        export_stls(proxy, args.output_dir)
+    # The transport kept one HTTP/1.1 connection open for all calls; close it
+    proxy('close')()
 
     print("\nDone! Rack panel with side bar retention generated successfully.")
     print(f"  FreeCAD: {args.fcstd_path}")